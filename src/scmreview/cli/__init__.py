@@ -16,7 +16,9 @@
 #
 from __future__ import absolute_import, division, print_function
 
+import bisect
 import sys
+import time
 import traceback
 
 try:
@@ -57,6 +59,11 @@ class CLI(object):
         # self.prev_line will be updated
         self.remember_empty_line = False
 
+        # readline may request completions for the exact same input several
+        # times in quick succession.  Completion results are reused for this
+        # many seconds as long as the input is unchanged.
+        self.completion_cache_time = 0.25
+
         # State, modifiable by subclasses
         self.stop = False
         self.line = None
@@ -67,11 +74,27 @@ class CLI(object):
 
         # Private state
         self._old_completer = None
+        # Whether input is being read from a terminal.  This is updated by
+        # setup_readline().
+        self._interactive = True
+        # A sorted list of the command names, used to find commands by
+        # prefix.  This is computed lazily, and reset when commands change.
+        self._sorted_command_names = None
+        # (key, completions, timestamp) for the most recent completion request
+        self._completion_cache = None
+        # (cmd_name, args, part, matches) for the last completion whose
+        # matches can be narrowed down as the user types more characters
+        self._incremental_completion = None
 
     def add_command(self, name, command):
         if name in self.commands:
             raise KeyError("command %r already exists" % (name,))
-        self.commands[name] = command
+        # Intern command names, since they are looked up on every command
+        # and completion
+        self.commands[sys.intern(name)] = command
+        self._sorted_command_names = None
+        self._completion_cache = None
+        self._incremental_completion = None
 
     def get_command(self, name):
         """
@@ -86,11 +109,9 @@ class CLI(object):
         commands that start with this prefix.
         """
         # First see if we have an exact match for this command
-        try:
-            return self.commands[name]
-        except KeyError:
-            # Fall through
-            pass
+        command = self.commands.get(name)
+        if command is not None:
+            return command
 
         # Perform completion to see how many commands match this prefix
         matches = self.complete_command(name)
@@ -104,19 +125,43 @@ class CLI(object):
         # XXX: We always write to sys.stdout for now.
         # This isn't configurable, since they python readline module
         # always uses sys.stdin and sys.stdout
-        sys.stdout.write(msg)
+        #
+        # sys.stdout is already block buffered when it is not a terminal, and
+        # it is flushed before each prompt is displayed.  Just make sure each
+        # message is handed to it in a single write() call.
         if newline:
-            sys.stdout.write("\n")
+            msg = "%s\n" % (msg,)
+        sys.stdout.write(msg)
+
+    def output_many(self, msgs):
+        """
+        Output several messages, each followed by a newline.
+
+        The messages are joined and written with a single write() call.
+        """
+        sys.stdout.write("".join("%s\n" % (msg,) for msg in msgs))
 
     def output_error(self, msg):
+        # Flush any pending normal output first, so the error appears after
+        # it rather than in the middle of it.
+        sys.stdout.flush()
         sys.stderr.write("error: %s\n" % (msg,))
 
     def readline(self):
         try:
-            return input(self.prompt)
+            line = input(self.prompt)
         except EOFError:
             return None
 
+        # Readline's automatic history is disabled in setup_readline(), so
+        # record the lines the user typed ourselves, skipping empty lines and
+        # immediate repeats.
+        if line and readline is not None and self._interactive:
+            history_len = readline.get_current_history_length()
+            if readline.get_history_item(history_len) != line:
+                readline.add_history(line)
+        return line
+
     def loop(self):
         # Always reset self.stop to False
         self.stop = False
@@ -154,7 +199,12 @@ class CLI(object):
         return rc
 
     def run_command(self, line, store=True):
-        if line == None:
+        # Running a command may change the state that completions are based
+        # on, so never reuse completions computed before this command.
+        self._completion_cache = None
+        self._incremental_completion = None
+
+        if line is None:
             return self.handle_eof()
 
         if not line:
@@ -181,6 +231,8 @@ class CLI(object):
 
         try:
             return cmd_entry.run(self, cmd_name, args, line)
+        except CommandArgumentsError as ex:
+            return self.handle_arguments_error(ex)
         except:
             return self.handle_command_exception()
 
@@ -216,14 +268,17 @@ class CLI(object):
         self.output_error("%s: ambiguous command: %s" % (cmd, matches))
         return -1
 
+    def handle_arguments_error(self, ex):
+        # CommandArgumentsError indicates the user entered
+        # invalid arguments.  Just print a normal error message,
+        # with no traceback.
+        self.output_error(ex)
+        return -1
+
     def handle_command_exception(self):
         ex = sys.exc_info()[1]
         if isinstance(ex, CommandArgumentsError):
-            # CommandArgumentsError indicates the user entered
-            # invalid arguments.  Just print a normal error message,
-            # with no traceback.
-            self.output_error(ex)
-            return -1
+            return self.handle_arguments_error(ex)
 
         tb = traceback.format_exc()
         self.output_error(tb)
@@ -232,33 +287,54 @@ class CLI(object):
     def complete(self, text, state):
         if state == 0:
             try:
-                self.completions = self.get_completions(text)
+                self.completions = self._get_cached_completions(text)
             except:
                 self.output_error("error getting completions")
                 tb = traceback.format_exc()
                 self.output_error(tb)
+                self.completions = None
                 return None
 
-        try:
-            return self.completions[state]
-        except IndexError:
+        # get_completions() returns None when the command name is invalid
+        completions = self.completions
+        if completions is None or state >= len(completions):
             return None
+        return completions[state]
+
+    def _get_cached_completions(self, text):
+        key = (
+            readline.get_line_buffer(),
+            readline.get_begidx(),
+            readline.get_endidx(),
+            text,
+        )
+        now = time.monotonic()
+        cache = self._completion_cache
+        if (
+            cache is not None
+            and cache[0] == key
+            and now - cache[2] < self.completion_cache_time
+        ):
+            return cache[1]
+
+        completions = self.get_completions(text)
+        self._completion_cache = (key, completions, now)
+        return completions
 
     def get_completions(self, text):
-        # strip the string down to just the part before endidx
+        # Only tokenize the part of the line before endidx
         # Things after endidx never affect our completion behavior
         line = readline.get_line_buffer()
         begidx = readline.get_begidx()
         endidx = readline.get_endidx()
-        line = line[:endidx]
 
-        (cmd_name, args, part) = self.parse_partial_line(line)
-        if part == None:
+        (cmd_name, args, part) = self.parse_partial_line(line, endidx)
+        if part is None:
             part = ""
 
-        if cmd_name == None:
+        if cmd_name is None:
             assert not args
-            matches = self.complete_command(part, add_space=True)
+            command = None
         else:
             try:
                 command = self.get_command(cmd_name)
@@ -266,12 +342,44 @@ class CLI(object):
                 # Not a valid command.  No matches
                 return None
 
-            matches = command.complete(self, cmd_name, args, part)
+        # If the user has only typed more characters of the same argument
+        # since the last completion, the new matches are a subset of the old
+        # ones, and are filtered by the loop below.  Only do this for command
+        # names, and for commands that declare their completions support it.
+        incremental = command is None or command.incremental_complete
+        prev = self._incremental_completion
+        if (
+            incremental
+            and prev is not None
+            and prev[0] == cmd_name
+            and prev[1] == args
+            and part.startswith(prev[2])
+        ):
+            matches = prev[3]
+        else:
+            if command is None:
+                matches = self.complete_command(part, add_space=True)
+            else:
+                matches = command.complete(self, cmd_name, args, part)
+            if incremental:
+                self._incremental_completion = (cmd_name, args, part, matches)
+            else:
+                self._incremental_completion = None
 
         # Massage matches to look like what readline expects
         # (since readline doesn't know about our exact tokenization routine)
+        # Note that a new list is built on every call: the result may be kept
+        # by _get_cached_completions(), so it can't be reused as a buffer.
         ret = []
+        append = ret.append
         part_len = len(part)
+        # Commands may return the same string more than once (e.g., a file's
+        # full path and its basename are identical for top-level files), so
+        # only escape each distinct suffix once.
+        escaped_suffixes = {}
+        # Bind names used on every iteration to locals
+        get_escaped = escaped_suffixes.get
+        escape_arg = tokenize.escape_arg
         for match in matches:
             add_space = False
             if isinstance(match, tuple):
@@ -286,17 +394,36 @@ class CLI(object):
                 # screwed up and we are ignoring some of the results.
                 continue
 
-            readline_match = text + tokenize.escape_arg(match[len(part) :])
+            suffix = match[part_len:]
+            escaped = get_escaped(suffix)
+            if escaped is None:
+                escaped = escape_arg(suffix)
+                escaped_suffixes[suffix] = escaped
+            readline_match = text + escaped
             if add_space:
                 readline_match += " "
-            ret.append(readline_match)
+            append(readline_match)
 
         return ret
 
     def complete_command(self, text, add_space=False):
-        matches = [
-            cmd_name for cmd_name in self.commands.keys() if cmd_name.startswith(text)
-        ]
+        # Subclasses may modify self.commands directly rather than calling
+        # add_command(), so also recompute the sorted names if the number of
+        # commands has changed.
+        names = self._sorted_command_names
+        if names is None or len(names) != len(self.commands):
+            names = sorted(self.commands)
+            self._sorted_command_names = names
+
+        # All names starting with text sort contiguously, beginning at the
+        # position where text itself would be inserted.
+        matches = []
+        idx = bisect.bisect_left(names, text)
+        num_names = len(names)
+        while idx < num_names and names[idx].startswith(text):
+            matches.append(names[idx])
+            idx += 1
+
         if add_space:
             matches = [(match, True) for match in matches]
         return matches
@@ -309,19 +436,26 @@ class CLI(object):
         to pass to the command function.  Default behavior is to tokenize the
         line, and return (tokens[0], tokens)
         """
-        tokenizer = tokenize.SimpleTokenizer(line)
-        tokens = tokenizer.get_tokens()
+        # Most lines contain no quotes or escapes, and can be split without
+        # running the full tokenizer.
+        tokens = tokenize.split_simple(line)
+        if tokens is None:
+            tokenizer = tokenize.SimpleTokenizer(line)
+            tokens = tokenizer.get_tokens()
         return (tokens[0], tokens)
 
-    def parse_partial_line(self, line):
+    def parse_partial_line(self, line, end=None):
         """
         cli.parse_line(line) --> (cmd, args, partial_arg)
 
         Returns a tuple consisting of the command name, and the arguments
         to pass to the command function.  Default behavior is to tokenize the
         line, and return (tokens[0], tokens)
+
+        If end is specified, only the portion of the line before index end is
+        parsed.
         """
-        tokenizer = tokenize.SimpleTokenizer(line)
+        tokenizer = tokenize.SimpleTokenizer(line, end)
         tokens = tokenizer.get_tokens(stop_at_end=False)
         if tokens:
             cmd_name = tokens[0]
@@ -330,15 +464,22 @@ class CLI(object):
         return (cmd_name, tokens, tokenizer.get_partial_token())
 
     def setup_readline(self):
-        if readline is None:
+        # There is no need to configure readline completion if stdin is not a
+        # terminal.
+        self._interactive = sys.stdin.isatty()
+        if readline is None or not self._interactive:
             return
         self._old_completer = readline.get_completer()
         readline.set_completer(self.complete)
         readline.parse_and_bind(self.completekey + ": complete")
+        # History entries are added explicitly by readline(), so that empty
+        # and repeated lines are not recorded.
+        readline.set_auto_history(False)
 
     def cleanup_readline(self):
-        if readline is None:
+        if readline is None or not self._interactive:
             return
+        readline.set_auto_history(True)
         if self._old_completer:
             readline.set_completer(self._old_completer)
         else:
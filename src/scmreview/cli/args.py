@@ -157,10 +157,10 @@ class IntArgument(Argument):
             msg = "%s must be an integer" % (self.get_hr_name(),)
             raise CommandArgumentsError(msg)
 
-        if self.min != None and value < self.min:
+        if self.min is not None and value < self.min:
             msg = "%s must be greater than %s" % (self.get_hr_name(), self.min)
             raise CommandArgumentsError(msg)
-        if self.max != None and value > self.max:
+        if self.max is not None and value > self.max:
             msg = "%s must be less than %s" % (self.get_hr_name(), self.max)
             raise CommandArgumentsError(msg)
 
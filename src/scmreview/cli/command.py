@@ -20,6 +20,12 @@ from .exceptions import *
 
 
 class Command(object):
+    # Set to True if complete() returns a superset of its results whenever
+    # the text being completed is extended.  The CLI can then filter the
+    # previous results as the user types, rather than calling complete()
+    # again.
+    incremental_complete = False
+
     def run(self, cli, name, args, line):
         raise NotImplementedError("subclasses of Command must implement run()")
 
@@ -32,6 +38,8 @@ class Command(object):
 
 
 class HelpCommand(Command):
+    incremental_complete = True
+
     def run(self, cli_obj, name, args, line):
         if len(args) < 2:
             for cmd_name in cli_obj.commands:
@@ -96,15 +96,21 @@ class Tokenizer(object):
     It isn't particularly efficient.  Performance-wise, it is probably quite
     slow.  However, it is intended to be very customizable.  It provides many
     hooks to allow subclasses to override and extend its behavior.
+
+    If end is specified, only the characters of value before index end are
+    tokenized.  This avoids having to copy a prefix of a long string.
     """
 
     STATE_NORMAL = 0
     STATE_IN_QUOTE = 1
 
-    def __init__(self, state, value):
+    def __init__(self, state, value, end=None):
         self.value = value
         self.index = 0
-        self.end = len(self.value)
+        if end is None:
+            self.end = len(self.value)
+        else:
+            self.end = end
 
         if isinstance(state, list):
             self.state_stack = state[:]
@@ -121,7 +127,7 @@ class Tokenizer(object):
 
         while True:
             token = self.get_next_token(stop_at_end)
-            if token == None:
+            if token is None:
                 break
             tokens.append(token)
 
@@ -178,13 +184,13 @@ class Tokenizer(object):
             raise Exception("cannot pop last state")
 
     def add_to_token(self, char):
-        if self.current_token == None:
+        if self.current_token is None:
             self.current_token = char
         else:
             self.current_token += char
 
     def end_token(self):
-        if self.current_token == None:
+        if self.current_token is None:
             return
 
         self.tokens.append(self.current_token)
@@ -192,8 +198,28 @@ class Tokenizer(object):
 
 
 class SimpleTokenizer(Tokenizer):
-    def __init__(self, value):
-        Tokenizer.__init__(self, [NormalState()], value)
+    def __init__(self, value, end=None):
+        Tokenizer.__init__(self, [NormalState()], value, end)
+
+
+# Characters that SimpleTokenizer treats specially, other than delimiters.
+_SIMPLE_SPECIAL_RE = re.compile(r"[\"'\\]")
+# SimpleTokenizer's delimiter characters
+_SIMPLE_DELIM_RE = re.compile("[ \t\n]+")
+
+
+def split_simple(value):
+    """
+    split_simple(value) --> tokens
+
+    Split a string that contains no quote or escape characters, producing
+    the same tokens that SimpleTokenizer would.  Returns None if the string
+    does contain quote or escape characters, in which case the caller must
+    fall back to SimpleTokenizer.
+    """
+    if _SIMPLE_SPECIAL_RE.search(value):
+        return None
+    return [token for token in _SIMPLE_DELIM_RE.split(value) if token]
 
 
 def escape_arg(arg):
@@ -48,7 +48,7 @@ def _adjust_index(i, length, dflt):
 def debug(msg):
     # Comment this line out to enable debug messages
     return
-    print >> sys.stderr, "DBG:", msg
+    print("DBG:", msg, file=sys.stderr)
 
 
 class Range(object):
@@ -62,18 +62,18 @@ class Range(object):
     def __len__(self):
         return self.end - self.start
 
-    def __nonzero__(self):
+    def __bool__(self):
         return self.end > self.start
 
     def __getitem__(self, i):
         mylen = len(self)
         if isinstance(i, slice):
-            if i.step != None and i.step != 1:
+            if i.step is not None and i.step != 1:
                 raise IndexError("non-contiguous slices are not allowed")
             start = _adjust_index(i.start, mylen, 0)
             stop = _adjust_index(i.stop, mylen, mylen)
         else:
-            assert isinstance(i, (int, long))
+            assert isinstance(i, int)
             start = _adjust_index(i, mylen, None)
             if start >= mylen:
                 raise IndexError(i)
@@ -137,12 +137,12 @@ class Section(object):
     def __getitem__(self, i):
         mylen = len(self.lines)
         if isinstance(i, slice):
-            if i.step != None and i.step != 1:
+            if i.step is not None and i.step != 1:
                 raise IndexError("non-contiguous slices are not allowed")
             start = _adjust_index(i.start, mylen, 0)
             stop = _adjust_index(i.stop, mylen, mylen)
         else:
-            assert isinstance(i, (int, long))
+            assert isinstance(i, int)
             start = _adjust_index(i, mylen, None)
             if start >= mylen:
                 raise IndexError(i)
@@ -184,7 +184,7 @@ class SectionIterator(object):
     def __iter__(self):
         return self
 
-    def next(self):
+    def __next__(self):
         hunk_len = len(self.hunk.lines)
         if self.index >= hunk_len:
             raise StopIteration()
@@ -355,7 +355,7 @@ class UnifiedDiffParser(object):
             # If we are currently in a state where EOF is not expected,
             # self.eofError will contain an error message.  Otherwise,
             # self.eofError will be None.
-            if self.eofError != None:
+            if self.eofError is not None:
                 self.parse_error("unexpected end of input: " + str(self.eofError))
 
         return self.diff
@@ -434,7 +434,7 @@ class UnifiedDiffParser(object):
         self.eofError = None
 
     def next_line(self):
-        line = self.input.next()
+        line = next(self.input)
         self.line_num += 1
 
         # TODO: it would be nice to warn if there is no newline
@@ -18,15 +18,23 @@ from __future__ import absolute_import, division, print_function
 
 import logging
 import os
+import re
 import subprocess
 import time
 from pathlib import Path
-from typing import Dict, Optional, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 from scmreview.scm.repo import RepositoryBase
 from ..git.diff import BlobInfo, DiffFileList, DiffEntry, Status
 
 
+# Commit names that always resolve to at most one commit: "." and full 40
+# character nodes.  Other bare words cannot be trusted to do so, since
+# HGPLAINEXCEPT=revsetalias lets any of them be a user-defined revset alias
+# that expands to any number of commits.
+_SINGLE_REV_NAME_RE = re.compile(r"^(?:\.|[0-9a-f]{40})$")
+
+
 class Repository(RepositoryBase):
     def __init__(self, path: Path) -> None:
         self.path = path
@@ -61,7 +69,6 @@ class Repository(RepositoryBase):
         if child == COMMIT_WD:
             if parent == COMMIT_WD:
                 return DiffFileList("", "")
-                return entries
             cmd += ["--rev", parent]
         elif parent == COMMIT_WD:
             cmd += ["--rev", self._get_node(parent)]
@@ -69,10 +76,17 @@ class Repository(RepositoryBase):
             # TODO: reverse statuses
             raise Exception("todo: reverse each file status after diff")
         else:
-            parent = self._get_node(parent)
-            child = self._get_node(child)
+            (parent, child) = self._get_nodes([parent, child])
             cmd += ["--rev", parent, "--rev", child]
 
+        # Restrict the status to the requested paths, if any.  If paths is
+        # the empty list, there is nothing to diff.
+        if paths is not None:
+            if not paths:
+                return DiffFileList(parent, child)
+            cmd.append("--")
+            cmd.extend("path:%s" % (path,) for path in paths)
+
         out = self.run_cmd(cmd)
         entries = DiffFileList(parent, child)
         DiffParser(entries, out).run()
@@ -100,7 +114,7 @@ class Repository(RepositoryBase):
 
         name = self._prevent_revnum(name)
         cmd = ["log", "-T{node}\n", "-r", name]
-        for n, v in aliases.items():
+        for n, v in real_aliases.items():
             cmd.append("--config")
             cmd.append("revsetalias.%s=%s" % (n, v))
 
@@ -139,13 +153,51 @@ class Repository(RepositoryBase):
         if result is not None:
             return result
 
-        name = self._prevent_revnum(name)
+        revset = self._prevent_revnum(name)
 
-        out = self.run_oneline(["log", "-T{node}", "-r", name])
+        out = self.run_oneline(["log", "-T{node}", "-r", revset])
         result = out.decode("utf-8")
-        self._node_cache[name] = result
+        self._cache_node(name, result)
         return result
 
+    def _cache_node(self, name: str, node: str) -> None:
+        self._node_cache[name] = node
+        # Callers frequently pass the resolved node back in later (e.g., to
+        # getDiff() after getCommitSha1()).  A full node always refers to the
+        # same commit, so remember it as resolving to itself.
+        self._node_cache[node] = node
+
+    def _get_nodes(self, names: List[str]) -> List[str]:
+        """Resolve several commit names, using a single hg command for all of
+        the names that are not already cached, where possible.
+        """
+        missing = []
+        for name in names:
+            if name not in self._node_cache and name not in missing:
+                missing.append(name)
+
+        # "hg log" with several -r options prints the union of the revsets,
+        # with no indication of which name each node came from, and with
+        # duplicate commits dropped.  Only batch names that resolve to a
+        # single commit, so the output can be matched up by position, and
+        # fall back to individual lookups if the output doesn't line up.
+        if len(missing) > 1 and all(
+            _SINGLE_REV_NAME_RE.match(name) for name in missing
+        ):
+            cmd = ["log", "-T{node}\n"]
+            for name in missing:
+                cmd += ["-r", self._prevent_revnum(name)]
+            try:
+                nodes = self.run_cmd(cmd).decode("utf-8").splitlines()
+            except Exception:
+                # Let _get_node() report the error for the bad name
+                nodes = []
+            if len(nodes) == len(missing):
+                for name, node in zip(missing, nodes):
+                    self._cache_node(name, node)
+
+        return [self._get_node(name) for name in names]
+
     def run_cmd(self, cmd, stdout=subprocess.PIPE):
         full_cmd = self.eden_cmd + cmd
         start = time.time()
@@ -203,6 +255,13 @@ DIFF_CODE_UNKNOWN = ord(b"?")
 DIFF_CODE_IGNORED = ord(b"I")
 DIFF_CODE_CLEAN = ord(b"C")
 
+# Status objects are never modified after creation, so every entry with a
+# given status can share the same one.
+STATUS_MODIFIED = Status(b"M")
+STATUS_ADDED = Status(b"A")
+STATUS_DELETED = Status(b"D")
+STATUS_RENAMED = Status(b"R")
+
 
 class DiffParser(object):
     def __init__(self, results: DiffFileList, data: bytes) -> None:
@@ -247,7 +306,7 @@ class DiffParser(object):
                 raise Exception(f"diff entry is missing status code: {path!r}")
 
             self._old_paths.add(path)
-            self.prev_entry.status = Status(b"R")
+            self.prev_entry.status = STATUS_RENAMED
             self.prev_entry.old = BlobInfo(sha1=b"", path=path, mode=b"0644")
             self.finish_prev_entry()
             return
@@ -257,10 +316,10 @@ class DiffParser(object):
         diff_path: Optional[bytes] = path
         old_path: Optional[bytes] = None
         if code == DIFF_CODE_MODIFIED:
-            status = Status(b"M")
+            status = STATUS_MODIFIED
             old_path = path
         elif code == DIFF_CODE_ADDED:
-            status = Status(b"A")
+            status = STATUS_ADDED
         elif code in (DIFF_CODE_REMOVED, DIFF_CODE_DELETED):
             # In practice removed entries are always listed after all added &
             # modified entries, so we should have already put all known old
@@ -269,7 +328,7 @@ class DiffParser(object):
                 # This path was moved away from, and we already added
                 # a DiffEntry for it using the new path.
                 return
-            status = Status(b"D")
+            status = STATUS_DELETED
             old_path = path
             diff_path = None
         elif code in (DIFF_CODE_UNKNOWN, DIFF_CODE_IGNORED, DIFF_CODE_CLEAN):
@@ -36,6 +36,10 @@ from . import diff
 from . import repo
 
 
+# The contents of a .git file in a worktree or submodule
+_GITDIR_RE = re.compile(r"^gitdir: (.*)\n?")
+
+
 def is_git_dir(path: Path) -> bool:
     """Determine if the specified directory is the root of a git repository
     directory.
@@ -89,7 +93,7 @@ def _get_git_dir(
 
     # If git_dir wasn't explicitly specified, but GIT_DIR is set in the
     # environment, use that.
-    if git_dir == None:
+    if git_dir is None:
         git_dir_env = os.environ.get("GIT_DIR")
         if git_dir_env is not None:
             git_dir = Path(git_dir_env)
@@ -103,15 +107,15 @@ def _get_git_dir(
 
     # Otherwise, attempt to find the git directory by searching up from
     # the current working directory.
-    ceiling_dirs = [Path(os.path.sep)]
-    ceiling_dirs_env = os.environ["GIT_CEILING_DIRECTORIES"]
+    ceiling_dirs = {Path(os.path.sep)}
+    ceiling_dirs_env = os.environ.get("GIT_CEILING_DIRECTORIES")
     if ceiling_dirs_env:
-        ceiling_dirs.extend(Path(p) for p in ceiling_dirs_env.split(":"))
+        ceiling_dirs.update(Path(p) for p in ceiling_dirs_env.split(":"))
 
     path = cwd.resolve(strict=False)
     while True:
         # Check to see if this directory contains a .git file or directory
-        ret = check_git_path(path)
+        ret = _find_git_path(path)
         if ret is not None:
             return ret
 
@@ -136,6 +140,23 @@ def check_git_path(path: Path) -> Optional[repo.Repository]:
     Check if the specified path refers contains a .git file or directory
     that refers to a git repository.
 
+    Returns a Repository object, or None if path does not contain a .git
+    file or directory.
+    """
+    ret = _find_git_path(path)
+    if ret is None:
+        return None
+
+    (git_path, working_dir) = ret
+    git_config = config.load(git_path)
+    return repo.Repository(git_path, working_dir, git_config)
+
+
+def _find_git_path(path: Path) -> Optional[Tuple[Path, Path]]:
+    """
+    Check if the specified path refers contains a .git file or directory
+    that refers to a git repository.
+
     Returns a tuple of (.git path, working directory path)
     """
     git_path = path / ".git"
@@ -144,13 +165,14 @@ def check_git_path(path: Path) -> Optional[repo.Repository]:
     except FileNotFoundError:
         return None
 
-    if stat.S_ISREG(stat_info.st_mode):
+    file_type = stat.S_IFMT(stat_info.st_mode)
+    if file_type == stat.S_IFREG:
         # Worktrees and submodules contain .git files that point to their git
         # directory location.  The file contains a single line of the format
         # "gitdir: <path>"
         with git_path.open() as f:
             first_line = f.readline()
-        m = re.match(r"^gitdir: (.*)\n?", first_line)
+        m = _GITDIR_RE.match(first_line)
         if m:
             # As long as the file matches the expected pattern, assume the git
             # directory it points to is valid.  In the case of worktrees, this
@@ -160,12 +182,10 @@ def check_git_path(path: Path) -> Optional[repo.Repository]:
             #
             # Return the path to the original .git file here as the git path,
             # and let git itself handle further resolution.
-            git_config = config.load(git_path)
-            return repo.Repository(git_path, path, git_config)
-    elif stat.S_ISDIR(stat_info.st_mode):
+            return (git_path, path)
+    elif file_type == stat.S_IFDIR:
         if is_git_dir(git_path):
-            git_config = config.load(git_path)
-            return repo.Repository(git_path, path, git_config)
+            return (git_path, path)
 
     return None
 
@@ -192,12 +212,12 @@ def get_repo(
 
     # If working_dir wasn't explicitly specified, but GIT_WORK_TREE is set in
     # the environment, use that.
-    if working_dir == None:
+    if working_dir is None:
         working_dir_env = os.environ.get("GIT_WORK_TREE")
         if working_dir_env is not None:
             working_dir = Path(working_dir_env)
 
-    if working_dir == None:
+    if working_dir is None:
         is_bare = git_config.getBool("core.bare", False)
         if is_bare:
             working_dir = None
@@ -206,6 +226,6 @@ def get_repo(
             if working_dir_cfg is None:
                 working_dir = default_working_dir
             else:
-                working_dir = (git_dir / working_dir).resolve()
+                working_dir = (git_dir / working_dir_cfg).resolve()
 
     return repo.Repository(git_dir, working_dir, git_config)
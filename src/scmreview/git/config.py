@@ -79,10 +79,11 @@ class Config(object):
         self.__contents[name] = [value]
 
     def add(self, name, value):
-        if name in self.__contents:
-            self.__contents[name].append(value)
-        else:
+        value_list = self.__contents.get(name)
+        if value_list is None:
             self.__contents[name] = [value]
+        else:
+            value_list.append(value)
 
 
 def parse(config_output: bytes) -> Config:
@@ -110,6 +110,9 @@ class Status(object):
 class BlobInfo(object):
     """Info about a git blob"""
 
+    # One BlobInfo is created for each side of every changed file
+    __slots__ = ("sha1", "path", "mode")
+
     def __init__(self, sha1, path, mode):
         self.sha1 = sha1.decode("utf-8")
         self.path = (
@@ -119,6 +122,8 @@ class BlobInfo(object):
 
 
 class DiffEntry(object):
+    __slots__ = ("old", "new", "status")
+
     def __init__(
         self, old_mode, new_mode, old_sha1, new_sha1, status, old_path, new_path
     ):
@@ -172,14 +177,14 @@ class DiffFileList(object):
 
     def add(self, entry):
         path = entry.getPath()
-        if path in self.entries:
+        old_entry = self.entries.get(path)
+        if old_entry is not None:
             # For unmerged files, "git diff --raw" will output a "U"
             # line, with the SHA1 IDs set to all 0.
             # Depending on how the file was changed, it will usually also
             # output a normal "M" line, too.
             #
             # For unmerged entries, merge these two entries.
-            old_entry = self.entries[path]
             if entry.status == Status.UNMERGED:
                 # Just update the status on the old_entry to UNMERGED.
                 # Keep all other data from the old entry.
@@ -222,7 +227,7 @@ class DiffFileList(object):
     def __len__(self):
         return len(self.entries)
 
-    def __nonzero__(self):
+    def __bool__(self):
         return bool(self.entries)
 
 
@@ -256,7 +261,7 @@ def get_diff_list(repo, parent, child, paths=None):
         commit_args = [str(parent), str(child)]
 
     # The arguments to select by path
-    if paths == None:
+    if paths is None:
         path_args = []
     elif not paths:
         # If paths is the empty list, there is nothing to diff
@@ -264,7 +269,7 @@ def get_diff_list(repo, parent, child, paths=None):
     else:
         path_args = paths
 
-    if commit_args == None or path_args == None:
+    if commit_args is None or path_args is None:
         # No diffs
         out = b""
     else:
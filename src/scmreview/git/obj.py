@@ -52,6 +52,10 @@ class TreeEntry(object):
 # An index entry isn't really an object as far as git is concerned,
 # but there doesn't seem to be a better location to define this class.
 class IndexEntry(object):
+    # Listing the index creates one IndexEntry per file, so define __slots__
+    # here too.
+    __slots__ = ("path", "mode", "sha1", "stage")
+
     def __init__(self, path, mode, sha1, stage):
         self.path = path
         self.mode = mode
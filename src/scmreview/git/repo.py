@@ -770,9 +770,5 @@ class Repository(RepositoryBase):
         # Split apart the commit name from any suffix
         commit_name, suffix = git_commit.split_rev_name(name)
 
-        try:
-            real_commit = aliases[commit_name]
-        except KeyError:
-            real_commit = commit_name
-
+        real_commit = aliases.get(commit_name, commit_name)
         return real_commit + suffix
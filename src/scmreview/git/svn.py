@@ -22,17 +22,16 @@ from . import commit as git_commit
 __all__ = ["GitSvnError", "get_svn_info", "get_svn_url"]
 
 
+# This pattern is the same one used by the perl git-svn code
+_SVN_ID_RE = re.compile(r"^\s*git-svn-id:\s+(.*)@(\d+)\s([a-f\d\-]+)$", re.MULTILINE)
+
+
 class GitSvnError(GitError):
     pass
 
 
 def _parse_svn_info(commit_msg):
-    # This pattern is the same one used by the perl git-svn code
-    m = re.search(
-        r"^\s*git-svn-id:\s+(.*)@(\d+)\s([a-f\d\-]+)$",
-        commit_msg,
-        re.MULTILINE,
-    )
+    m = _SVN_ID_RE.search(commit_msg)
     if not m:
         raise GitSvnError("failed to parse git-svn-id from commit message")
 
@@ -46,7 +45,7 @@ def get_svn_info(commit):
     """
     Parse the SVN URL, revision number, and UUID out of a git commit's message.
     """
-    return _parse_svn_info(commit.message)
+    return _parse_svn_info(commit.comment)
 
 
 def get_svn_url(repo, commit=None):
@@ -64,7 +63,7 @@ def get_svn_url(repo, commit=None):
         # try to parse it first.  If it contains a git-svn-id,
         # we will have avoided making an external call to git.
         try:
-            (url, rev, uuid) = _parse_svn_info(commit.message)
+            (url, rev, uuid) = _parse_svn_info(commit.comment)
             return url
         except GitSvnError:
             # It probably doesn't have a git-svn-id in the message.
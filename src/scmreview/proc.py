@@ -87,7 +87,7 @@ def _check_result(args, result, expected, cmd_err, ex_class):
     if expected == ANY:
         return
 
-    if expected == None:
+    if expected is None:
         raise ex_class(args, result, expected, cmd_err)
 
     if isinstance(expected, (list, tuple)):
@@ -109,7 +109,7 @@ class Review(object):
     def get_file(self, commit: str, path: Optional[str]) -> tmpfile.TmpFile:
         expanded_commit = self.expand_commit_name(commit)
 
-        if path == None:
+        if path is None:
             # This happens if the user tries to view the child version
             # of a deleted file, or the parent version of a new file.
             raise git.NoSuchBlobError("%s:<None>" % (commit,))
@@ -16,6 +16,7 @@
 #
 from __future__ import absolute_import, division, print_function
 
+import operator
 import os
 import platform
 import subprocess
@@ -289,6 +290,7 @@ class ListCommand(cli.ArgCommand):
         index_width = len(str(max_index))
 
         # List the entries
+        msgs = []
         n = 0
         for entry in entries:
             msg = "%*s: %s " % (index_width, n, entry.status.getChar())
@@ -304,8 +306,9 @@ class ListCommand(cli.ArgCommand):
                 )
             else:
                 msg += entry.getPath()
-            cli_obj.output(msg)
+            msgs.append(msg)
             n += 1
+        cli_obj.output_many(msgs)
 
 
 class NextCommand(cli.ArgCommand):
@@ -547,10 +550,11 @@ class AliasCommand(cli.ArgCommand):
         if args.alias is None:
             # Show all aliases
             sorted_aliases = sorted(
-                cli_obj.review.commit_aliases.items(), key=lambda x: x[0]
+                cli_obj.review.commit_aliases.items(), key=operator.itemgetter(0)
+            )
+            cli_obj.output_many(
+                "%s: %s" % (alias, commit) for alias, commit in sorted_aliases
             )
-            for alias, commit in sorted_aliases:
-                cli_obj.output("%s: %s" % (alias, commit))
         elif args.commit is None:
             # Show the specified alias
             try:
@@ -778,7 +782,7 @@ class CliReviewer(cli.CLI):
 
     def get_diff_command(self, path1, path2, path3=None):
         cmd = self.diff_command + [str(path1), str(path2)]
-        if path3 != None:
+        if path3 is not None:
             cmd.append(str(path3))
         return cmd
 
@@ -24,10 +24,10 @@ import scmreview.git.repo
 
 
 def find_repo(path: Path) -> Optional[RepositoryBase]:
-    ceiling_dirs = [Path(os.path.sep)]
+    ceiling_dirs = {Path(os.path.sep)}
     ceiling_dirs_env = os.environ.get("GIT_CEILING_DIRECTORIES")
     if ceiling_dirs_env:
-        ceiling_dirs.extend(Path(p) for p in ceiling_dirs_env.split(":"))
+        ceiling_dirs.update(Path(p) for p in ceiling_dirs_env.split(":"))
 
     initial_path = path
     path = path.resolve(strict=False)